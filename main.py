@@ -1,7 +1,134 @@
 import os
+import re
+import sys
+from array import array
+
+try:
+    from tm_core import tm_run
+except ImportError:  # Extension Cython optionnelle (cythonize -i tm_core.pyx)
+    tm_run = None
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # Numba est optionnel : repli sur la boucle Python
+    np = None
+    njit = None
+
+# En-têtes reconnus dans les fichiers de définition de machine
+HEADER = re.compile(
+    r"(states|tape symbols|blank symbol|initial state|final states?|transition rules):\s*(.*)"
+)
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _run_nb(
+        tape, head, left, right, origin, state, trans, final_mask, blank, steps
+    ):
+        """
+        Boucle d'exécution compilée par Numba.
+
+        :param tape: Tampon du ruban (numpy.uint8), la partie utile étant [left, right)
+        :param origin: Indice du début de l'entrée, décalé comme la tête
+        :param trans: Table dense (nb_états, nb_symboles, 3) : nouvel état
+                      (-1 si aucune transition), symbole écrit, déplacement
+        :param final_mask: Tableau booléen indiquant les états finaux
+        :param steps: Nombre maximal de transitions à appliquer
+        :return: (tape, head, left, right, origin, state, statut) où le statut
+                 vaut 1 si la machine accepte, 0 si elle rejette, -1 si elle
+                 n'est pas arrêtée après steps transitions
+        """
+        while True:
+            if final_mask[state]:
+                return tape, head, left, right, origin, state, 1
+            symbol = tape[head]
+            next_state = trans[state, symbol, 0]
+            if next_state < 0:
+                return tape, head, left, right, origin, state, 0
+            if steps == 0:
+                return tape, head, left, right, origin, state, -1
+            steps -= 1
+
+            tape[head] = trans[state, symbol, 1]
+            head += trans[state, symbol, 2]
+            state = next_state
+
+            if head < left:
+                left = head
+                if head < 0:
+                    # Double le tampon par la gauche
+                    cap = tape.shape[0]
+                    grown = np.full(2 * cap, blank, np.uint8)
+                    grown[cap:] = tape
+                    tape = grown
+                    head += cap
+                    left += cap
+                    right += cap
+                    origin += cap
+            elif head >= right:
+                right = head + 1
+                if right > tape.shape[0]:
+                    # Double le tampon par la droite
+                    cap = tape.shape[0]
+                    grown = np.full(2 * cap, blank, np.uint8)
+                    grown[:cap] = tape
+                    tape = grown
+
+else:
+    _run_nb = None
+
+
+class _LoopDetector:
+    """
+    Détecte qu'une machine repasse par une configuration déjà vue.
+
+    Les configurations (état, position de la tête, ruban) sont relevées à
+    intervalles réguliers et comparées à une configuration de référence,
+    remplacée à chaque puissance de deux relevés (algorithme de Brent) : une
+    seule copie du ruban est conservée.
+    """
+
+    def __init__(self):
+        self.saved = None
+        self.power = 1
+        self.count = 0
+
+    def check(self, tm):
+        """Retourne True si la configuration courante de tm est déjà apparue."""
+        offset = tm.head_position - tm.left
+        if self.saved is not None:
+            state, saved_offset, cells = self.saved
+            if state == tm._state and saved_offset == offset:
+                with memoryview(tm.tape) as view:
+                    if view[tm.left : tm.right] == cells:
+                        return True
+
+        self.count += 1
+        if self.count == self.power:
+            self.saved = (tm._state, offset, bytes(tm.tape[tm.left : tm.right]))
+            self.power *= 2
+            self.count = 0
+        return False
 
 
 class TuringMachine:
+    # Déplacement de la tête pour chaque direction ; toute autre direction
+    # laisse la tête en place
+    DIRECTIONS = {"R": 1, "L": -1, "S": 0}
+
+    # Nombre d'étapes affichées regroupées en une seule écriture en mode verbeux
+    OUTPUT_BATCH = 256
+
+    # Nombre maximal d'étapes d'une exécution, et intervalle (en étapes) entre
+    # deux recherches d'une configuration répétée. Les noyaux natifs (Cython,
+    # Numba) utilisent un intervalle plus long pour que le coût de chaque
+    # retour en Python reste négligeable devant celui des étapes.
+    MAX_STEPS = 10**7
+    CHECK_INTERVAL = 1024
+    NATIVE_CHECK_INTERVAL = 2**20
+
     def __init__(
         self,
         states,
@@ -25,12 +152,136 @@ class TuringMachine:
         self.states = states
         self.tape_symbols = tape_symbols
         self.blank = blank_symbol
-        self.current_state = initial_state
         self.initial_state = initial_state
-        self.final_states = final_states
+        self.final_states = frozenset(final_states)
         self.transitions = transitions
-        self.tape = []
+
+        # Numérote les états et les symboles une fois pour toutes : la boucle
+        # d'exécution ne manipule ensuite que des entiers.
+        self._state_names = []
+        self._state_id = {}
+        for state in [*states, initial_state, *final_states]:
+            self._intern_state(state)
+        self._symbols = []
+        self._sym_id = {}
+        for symbol in [*tape_symbols, blank_symbol]:
+            self._intern_symbol(symbol)
+        for (state, symbol), (new_state, write_symbol, _) in transitions.items():
+            self._intern_state(state)
+            self._intern_state(new_state)
+            self._intern_symbol(symbol)
+            self._intern_symbol(write_symbol)
+        self._blank_id = self._sym_id[blank_symbol]
+        self._final_ids = frozenset(self._state_id[s] for s in final_states)
+        self._build_transitions()
+        self.reset()
+
+    def reset(self):
+        """
+        Remet la machine dans son état initial avec un ruban vide.
+
+        Les tables construites à l'initialisation sont conservées : une même
+        machine peut être exécutée sur plusieurs entrées sans les recalculer.
+        """
+        self._state = self._state_id[self.initial_state]
+        # Le ruban est un tampon d'identifiants de symboles dont seule la
+        # partie [left, right) est utile ; le reste est vide.
+        self.tape = bytearray([self._blank_id])
+        self.left = 0
+        self.right = 1
         self.head_position = 0
+        # Caractères de l'entrée hors de l'alphabet, par position dans
+        # l'entrée, et indice du tampon où commence l'entrée
+        self._unknown = {}
+        self._origin = 0
+
+    @property
+    def current_state(self):
+        """Nom de l'état courant."""
+        return self._state_names[self._state]
+
+    @current_state.setter
+    def current_state(self, state):
+        self._state = self._intern_state(state)
+        if self._state >= len(self._table):
+            self._build_transitions()
+
+    def _intern_state(self, state):
+        """Retourne l'identifiant entier d'un état, en l'ajoutant si besoin."""
+        state_id = self._state_id.get(state)
+        if state_id is None:
+            state_id = self._state_id[state] = len(self._state_names)
+            self._state_names.append(state)
+        return state_id
+
+    def _intern_symbol(self, symbol):
+        """Retourne l'identifiant entier d'un symbole, en l'ajoutant si besoin."""
+        symbol_id = self._sym_id.get(symbol)
+        if symbol_id is None:
+            # Le dernier identifiant d'octet est réservé aux symboles inconnus
+            if len(self._symbols) >= 255:
+                raise ValueError("Une machine ne peut pas avoir plus de 255 symboles.")
+            symbol_id = self._sym_id[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return symbol_id
+
+    def _build_transitions(self):
+        """
+        Construit la table de transition dense indexée par identifiants.
+
+        Format : table[id_état][id_symbole] = (id_nouvel_état, id_symbole_écrit, déplacement)
+        où le déplacement vaut +1 (R), -1 (L) ou 0, et None si aucune transition.
+        Le dernier identifiant désigne tout symbole de l'entrée hors de
+        l'alphabet : aucune transition ne le lit ni ne l'écrit.
+        """
+        self._unknown_id = len(self._symbols)
+        self._nsym = self._unknown_id + 1
+        self._jit_tables = None
+        self._c_tables = None
+        self._compiled = None
+        self._table = [[None] * self._nsym for _ in self._state_names]
+        for (state, symbol), transition in self.transitions.items():
+            new_state, write_symbol, direction = transition
+            self._table[self._state_id[state]][self._sym_id[symbol]] = (
+                self._state_id[new_state],
+                self._sym_id[write_symbol],
+                self.DIRECTIONS.get(direction, 0),
+            )
+
+        # Si chaque symbole tient sur un octet, le ruban se code et se décode
+        # d'un seul appel à bytes.translate
+        self._encode_table = self._decode_table = None
+        if all(len(symbol) == 1 and ord(symbol) < 256 for symbol in self._symbols):
+            encoded = "".join(self._symbols).encode("latin-1")
+            ids = bytes(range(self._unknown_id))
+            self._encode_table = bytes.maketrans(encoded, ids)
+            self._decode_table = bytes.maketrans(ids, encoded)
+
+    def _build_jit_tables(self):
+        """Construit la table dense et le masque des états finaux pour Numba."""
+        n_states = len(self._state_names)
+        trans = np.full((n_states, self._nsym, 3), -1, dtype=np.int32)
+        trans[:, :, 2] = 0
+        for state, row in enumerate(self._table):
+            for symbol, transition in enumerate(row):
+                if transition is not None:
+                    trans[state, symbol] = transition
+        final_mask = np.zeros(n_states, dtype=np.bool_)
+        final_mask[list(self._final_ids)] = True
+        self._jit_tables = (trans, final_mask)
+        return self._jit_tables
+
+    def _build_c_tables(self):
+        """Construit la table aplatie et les états finaux pour tm_core."""
+        table = array("i", [-1, 0, 0]) * (len(self._table) * self._nsym)
+        for state, row in enumerate(self._table):
+            for symbol, transition in enumerate(row):
+                if transition is not None:
+                    offset = (state * self._nsym + symbol) * 3
+                    table[offset : offset + 3] = array("i", transition)
+        final = bytes(state in self._final_ids for state in range(len(self._table)))
+        self._c_tables = (table, final)
+        return self._c_tables
 
     def initialize_tape(self, input_string):
         """
@@ -38,105 +289,403 @@ class TuringMachine:
 
         :param input_string: Chaîne de symboles à placer sur le ruban
         """
-        # Convertit la chaîne en liste de symboles
-        self.tape = list(input_string)
-        # Ajoute un symbole vide à la fin pour simuler l'infini
-        self.tape.append(self.blank)
-        self.head_position = 0
+        if self._encode_table is not None and self._sym_id.keys() >= set(input_string):
+            # Que des symboles connus d'un octet : conversion sans objet par case
+            symbols = input_string.encode("latin-1").translate(self._encode_table)
+        else:
+            # Les symboles hors de l'alphabet partagent un identifiant réservé,
+            # sans transition ; on garde le caractère d'origine pour l'affichage
+            symbols = bytearray(len(input_string))
+            for i, c in enumerate(input_string):
+                symbol_id = self._sym_id.get(c)
+                if symbol_id is None:
+                    symbol_id = self._unknown_id
+                    self._unknown[i] = c
+                symbols[i] = symbol_id
+
+        # Centre l'entrée, suivie d'un symbole vide pour simuler l'infini, dans
+        # un tampon avec de la marge des deux côtés
+        size = len(symbols) + 1
+        cap = max(64, 4 * size)
+        self.tape = bytearray([self._blank_id]) * cap
+        self.left = (cap - size) // 2
+        self.right = self.left + size
+        self.tape[self.left : self.right - 1] = symbols
+        self.head_position = self.left
+        self._origin = self.left
+
+    def _grow(self, leftward):
+        """
+        Double la capacité du tampon du ruban, en place, du côté où sort la tête.
+
+        :param leftward: True pour étendre à gauche, False à droite
+        :return: Décalage appliqué aux indices du tampon
+        """
+        margin = bytes([self._blank_id]) * len(self.tape)
+        if not leftward:
+            self.tape += margin
+            return 0
+        # Insertion en tête par affectation de tranche : un seul déplacement
+        # mémoire, sans copie intermédiaire du ruban
+        self.tape[:0] = margin
+        self.left += len(margin)
+        self.right += len(margin)
+        self._origin += len(margin)
+        return len(margin)
 
     def step(self):
         """
         Exécute une étape de la machine.
         Retourne True si la machine doit continuer, False si elle s'arrête.
         """
+        state = self._state
+        tape = self.tape
+        head = self.head_position
+
         # Si dans un état final, on s'arrête
-        if self.current_state in self.final_states:
+        if state in self._final_ids:
             return False
 
-        # Lit le symbole sous la tête
-        if self.head_position >= len(self.tape):
-            # Si hors du ruban actuel, considère le symbole vide
-            current_symbol = self.blank
-        else:
-            current_symbol = self.tape[self.head_position]
-
-        # Cherche la transition correspondante
-        key = (self.current_state, current_symbol)
-        if key not in self.transitions:
+        # Cherche la transition pour le symbole sous la tête (toujours dans la
+        # partie utile du ruban)
+        transition = self._table[state][tape[head]]
+        if transition is None:
             # Pas de transition = rejet (arrêt)
             return False
 
-        # Applique la transition
-        new_state, write_symbol, direction = self.transitions[key]
-
-        # Écrit le nouveau symbole
-        if self.head_position >= len(self.tape):
-            self.tape.append(write_symbol)
-        else:
-            self.tape[self.head_position] = write_symbol
+        # Applique la transition : écrit le symbole, change d'état, déplace la tête
+        self._state, tape[head], delta = transition
+        head += delta
 
-        # Met à jour l'état
-        self.current_state = new_state
-
-        # Déplace la tête
-        if direction == "R":
-            self.head_position += 1
-        elif direction == "L":
-            self.head_position -= 1
-
-        # Si on va à gauche du début, étend le ruban
-        if self.head_position < 0:
-            self.tape.insert(0, self.blank)
-            self.head_position = 0
+        # Si on va à gauche du début, étend le ruban (la case est déjà vide)
+        if head < self.left:
+            if head < 0:
+                head += self._grow(True)
+            self.left = head
 
         # Si on va à droite de la fin, étend le ruban
-        if self.head_position >= len(self.tape):
-            self.tape.append(self.blank)
+        elif head >= self.right:
+            if head >= len(tape):
+                self._grow(False)
+            self.right = head + 1
 
+        self.head_position = head
         return True
 
-    def run(self, input_string, verbose=True):
+    def run(self, input_string, verbose=True, max_steps=None):
         """
         Exécute la machine sur une entrée donnée.
 
+        L'entrée est rejetée si la machine ne s'arrête pas en max_steps étapes
+        ou si elle repasse par une configuration déjà vue (elle boucle).
+
         :param input_string: Chaîne d'entrée
         :param verbose: Afficher les étapes si True
+        :param max_steps: Nombre maximal d'étapes (MAX_STEPS par défaut)
         :return: True si accepté, False si rejeté
         """
-        # Initialise le ruban
+        if not verbose:
+            return self.run_fast(input_string, max_steps)
+        if max_steps is None:
+            max_steps = self.MAX_STEPS
+
+        # Repart de l'état initial et initialise le ruban
+        self.reset()
         self.initialize_tape(input_string)
         step_count = 0
 
-        if verbose:
-            print(f"Entrée: {input_string}")
-            print(f"État initial: {self.current_state}")
-            self.print_tape()
-
-        # Exécute les étapes
-        while self.step():
+        out = sys.stdout
+        out.write(
+            f"Entrée: {input_string}\n"
+            f"État initial: {self.current_state}\n"
+            f"{self._format_tape()}"
+        )
+
+        # Exécute les étapes, en écrivant leur trace par paquets
+        pending = []
+        detector = _LoopDetector()
+        stopped = None
+        while step_count < max_steps and self.step():
             step_count += 1
-            if verbose:
-                print(f"\nÉtape {step_count}:")
-                print(f"État: {self.current_state}")
-                self.print_tape()
+            pending.append(
+                f"\nÉtape {step_count}:\n"
+                f"État: {self.current_state}\n"
+                f"{self._format_tape()}"
+            )
+            if len(pending) >= self.OUTPUT_BATCH:
+                out.writelines(pending)
+                pending.clear()
+            if step_count % self.CHECK_INTERVAL == 0 and detector.check(self):
+                stopped = "la machine boucle"
+                break
+        out.writelines(pending)
+
+        # Vérifie le résultat ; la limite d'étapes n'interrompt que les machines
+        # qui pouvaient encore avancer
+        accepted = self._state in self._final_ids
+        if (
+            step_count >= max_steps
+            and not accepted
+            and self._table[self._state][self.tape[self.head_position]] is not None
+        ):
+            stopped = f"limite de {max_steps} étapes atteinte"
+        if stopped:
+            out.write(f"\nArrêt : {stopped}.\n")
+
+        out.write(
+            "\n" + "=" * 50 + "\n"
+            f"Machine {'accepte' if accepted else 'rejette'} l'entrée.\n"
+            f"État final: {self.current_state}\n"
+            f"Nombre d'étapes: {step_count}\n"
+        )
+
+        return accepted
+
+    def run_fast(self, input_string, max_steps=None):
+        """
+        Exécute la machine sur une entrée donnée, sans affichage.
+
+        Même sémantique que run(), mais la boucle est confiée à l'extension
+        tm_core ou au noyau Numba s'ils sont disponibles, sinon à la fonction
+        générée par compile(). Elle s'exécute par tranches de CHECK_INTERVAL
+        étapes (NATIVE_CHECK_INTERVAL pour les noyaux natifs), entre
+        lesquelles on vérifie que la machine ne boucle pas.
 
-        # Vérifie le résultat
-        accepted = self.current_state in self.final_states
+        :param input_string: Chaîne d'entrée
+        :param max_steps: Nombre maximal d'étapes (MAX_STEPS par défaut)
+        :return: True si accepté, False si rejeté
+        """
+        self.reset()
+        self.initialize_tape(input_string)
+        interval = self.NATIVE_CHECK_INTERVAL
+        if tm_run is not None:
+            kernel = self._run_c
+        elif _run_nb is not None:
+            kernel = self._run_jit
+        else:
+            kernel = self._run_compiled
+            interval = self.CHECK_INTERVAL
+
+        remaining = self.MAX_STEPS if max_steps is None else max_steps
+        detector = _LoopDetector()
+        while True:
+            steps = min(interval, remaining)
+            accepted = kernel(steps)
+            if accepted is not None:
+                return accepted
+            remaining -= steps
+            if remaining <= 0 or detector.check(self):
+                return False
+
+    def compile(self):
+        """
+        Génère une fonction Python spécialisée pour cette machine.
 
-        if verbose:
-            print("\n" + "=" * 50)
-            print(f"Machine {'accepte' if accepted else 'rejette'} l'entrée.")
-            print(f"État final: {self.current_state}")
-            print(f"Nombre d'étapes: {step_count}")
+        Chaque transition y devient une branche sur des constantes entières :
+        l'exécution ne consulte plus aucune table. L'état courant est
+        sélectionné par dichotomie, le symbole lu par une suite de tests. La
+        fonction est mise en cache jusqu'à ce que la table soit reconstruite.
+
+        :return: Fonction _run(tape, head, left, right, state, steps, grow)
+                 renvoyant (accepté, état, tête, left, right), accepté valant
+                 None si la machine n'est pas arrêtée après steps transitions
+        """
+        if self._compiled is not None:
+            return self._compiled
+
+        lines = [
+            "def _run(tape, head, left, right, state, steps, grow):",
+            "    while True:",
+            "        symbol = tape[head]",
+        ]
+        self._emit_states(lines, 0, len(self._table), "        ")
+
+        namespace = {}
+        exec(compile("\n".join(lines), "<machine de Turing>", "exec"), namespace)
+        self._compiled = namespace["_run"]
+        return self._compiled
+
+    def _emit_states(self, lines, first, last, indent):
+        """Ajoute à lines le code traitant les états d'identifiant [first, last)."""
+        if last - first > 1:
+            middle = (first + last) // 2
+            lines.append(f"{indent}if state < {middle}:")
+            self._emit_states(lines, first, middle, indent + "    ")
+            lines.append(f"{indent}else:")
+            self._emit_states(lines, middle, last, indent + "    ")
+            return
+
+        stop = "return {}, state, head, left, right"
+        if first in self._final_ids:
+            lines.append(indent + stop.format(True))
+            return
+
+        branch = "if"
+        for symbol, transition in enumerate(self._table[first]):
+            if transition is None:
+                continue
+            new_state, write_symbol, delta = transition
+            lines.append(f"{indent}{branch} symbol == {symbol}:")
+            branch = "elif"
+            body = indent + "    "
+            lines += [
+                f"{body}if not steps:",
+                f"{body}    {stop.format(None)}",
+                f"{body}steps -= 1",
+            ]
+            if write_symbol != symbol:
+                lines.append(f"{body}tape[head] = {write_symbol}")
+            if new_state != first:
+                lines.append(f"{body}state = {new_state}")
+            if delta < 0:
+                lines += [
+                    f"{body}head -= 1",
+                    f"{body}if head < left:",
+                    f"{body}    if head < 0:",
+                    f"{body}        shift = grow(left, right, True)",
+                    f"{body}        head += shift",
+                    f"{body}        right += shift",
+                    f"{body}    left = head",
+                ]
+            elif delta > 0:
+                lines += [
+                    f"{body}head += 1",
+                    f"{body}if head >= right:",
+                    f"{body}    if head >= len(tape):",
+                    f"{body}        grow(left, right, False)",
+                    f"{body}    right = head + 1",
+                ]
+            else:
+                lines.append(f"{body}pass")
+
+        if branch == "if":
+            lines.append(indent + stop.format(False))
+        else:
+            lines += [f"{indent}else:", f"{indent}    {stop.format(False)}"]
+
+    def _run_compiled(self, steps):
+        """
+        Exécute au plus steps transitions avec la fonction générée par compile().
 
+        :return: True si accepté, False si rejeté, None si non arrêtée
+        """
+
+        # _grow étend le tampon en place : la fonction générée garde donc
+        # une référence valide au ruban et n'applique que le décalage.
+        def grow(left, right, leftward):
+            self.left, self.right = left, right
+            return self._grow(leftward)
+
+        run = self.compile()
+        accepted, self._state, self.head_position, self.left, self.right = run(
+            self.tape,
+            self.head_position,
+            self.left,
+            self.right,
+            self._state,
+            steps,
+            grow,
+        )
         return accepted
 
+    def _run_c(self, steps):
+        """
+        Exécute au plus steps transitions avec l'extension tm_core.
+
+        :return: True si accepté, False si rejeté, None si non arrêtée
+        """
+        table, final = self._c_tables or self._build_c_tables()
+        head, left, right = self.head_position, self.left, self.right
+        state = self._state
+        while True:
+            status, head, left, right, state, steps = tm_run(
+                self.tape, head, left, right, state, steps, table, final, self._nsym
+            )
+            if status != -1:
+                break
+            # La tête est sortie du tampon : l'agrandit puis reprend
+            self.left, self.right = left, right
+            head += self._grow(head < 0)
+            left, right = self.left, self.right
+
+        self._state = state
+        self.head_position = head
+        self.left = left
+        self.right = right
+        return None if status < 0 else bool(status)
+
+    def _run_jit(self, steps):
+        """
+        Exécute au plus steps transitions avec le noyau Numba.
+
+        :return: True si accepté, False si rejeté, None si non arrêtée
+        """
+        trans, final_mask = self._jit_tables or self._build_jit_tables()
+
+        # Le noyau travaille directement dans le tampon du ruban ; il ne le
+        # remplace que s'il a dû l'agrandir.
+        buffer = np.frombuffer(self.tape, dtype=np.uint8)
+        tape, head, left, right, origin, state, status = _run_nb(
+            buffer,
+            self.head_position,
+            self.left,
+            self.right,
+            self._origin,
+            self._state,
+            trans,
+            final_mask,
+            self._blank_id,
+            steps,
+        )
+
+        if tape is not buffer:
+            self.tape = bytearray(tape)
+        self.head_position = int(head)
+        self.left = int(left)
+        self.right = int(right)
+        self._origin = int(origin)
+        self._state = int(state)
+        return None if status < 0 else bool(status)
+
+    def _format_tape(self):
+        """Retourne les lignes d'affichage du ruban et de la position de la tête."""
+        cells = self.tape[self.left : self.right]
+        if self._decode_table is not None and not self._unknown:
+            tape_str = cells.translate(self._decode_table).decode("latin-1")
+        else:
+            # Les cases d'identifiant réservé n'ont jamais été écrites : elles
+            # contiennent encore le caractère de l'entrée
+            symbols = self._symbols
+            unknown, origin = self._unknown_id, self._origin
+            tape_str = "".join(
+                self._unknown[i - origin] if s == unknown else symbols[s]
+                for i, s in enumerate(cells, self.left)
+            )
+        # Aligne le '^' sous la tête sans construire de chaîne intermédiaire
+        width = self.head_position - self.left + 1
+        return f"Ruban: {tape_str}\nTête : {'^':>{width}}\n"
+
     def print_tape(self):
         """Affiche le ruban avec la position de la tête."""
-        tape_str = "".join(self.tape)
-        head_indicator = " " * self.head_position + "^"
-        print(f"Ruban: {tape_str}")
-        print(f"Tête : {head_indicator}")
+        sys.stdout.write(self._format_tape())
+
+
+def parse_rule(rule):
+    """
+    Analyse une règle de transition.
+
+    :param rule: Règle au format 'état,symbole→état,symbole,direction'
+    :return: ((état, symbole), (nouvel_état, symbole_écrit, direction))
+    :raises ValueError: Si la règle est mal formée
+    """
+    left, right = rule.split("→")
+    state, symbol = left.split(",")
+    new_state, write_symbol, direction = right.split(",")
+    return (state.strip(), symbol.strip()), (
+        new_state.strip(),
+        write_symbol.strip(),
+        direction.strip().upper(),
+    )
 
 
 def create_machine_from_input():
@@ -181,17 +730,9 @@ def create_machine_from_input():
             break
 
         try:
-            # Parse la règle
-            left, right = rule.split("→")
-            state, symbol = left.split(",")
-            new_state, write_symbol, direction = right.split(",")
-
-            # Ajoute à la table de transition
-            transitions[(state.strip(), symbol.strip())] = (
-                new_state.strip(),
-                write_symbol.strip(),
-                direction.strip().upper(),
-            )
+            # Parse la règle et l'ajoute à la table de transition
+            key, value = parse_rule(rule)
+            transitions[key] = value
         except ValueError:
             print("Format incorrect! Utilisez: état,symbole→état,symbole,direction")
 
@@ -202,51 +743,68 @@ def create_machine_from_input():
 
 
 def load_machine_from_file(file_path):
-    transitions = {}
-    states = []
-    tape_symbols = []
-    blank = "_"
-    initial_state = ""
-    final_states = []
+    with open(file_path, "r") as f:
+        lines = f.read().splitlines()
+
+    fields = {}
+    rules = []
     reading_transitions = False
 
-    with open(file_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue  # ignore empty lines or comments
-
-            if line.startswith("states:"):
-                states = [s.strip() for s in line.split(":")[1].split(",")]
-            elif line.startswith("tape symbols:"):
-                tape_symbols = [s.strip() for s in line.split(":")[1].split(",")]
-            elif line.startswith("blank symbol:"):
-                blank = line.split(":")[1].strip()
-            elif line.startswith("initial state:"):
-                initial_state = line.split(":")[1].strip()
-            elif line.startswith("final state:") or line.startswith("final states:"):
-                final_states = [s.strip() for s in line.split(":")[1].split(",")]
-            elif line.startswith("transition rules:"):
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue  # ignore empty lines or comments
+
+        header = HEADER.match(line)
+        if header:
+            name, value = header.groups()
+            if name == "final state":
+                name = "final states"
+            fields[name] = value
+            if name == "transition rules":
                 reading_transitions = True
-            elif reading_transitions:
-                if line.startswith("]"):
-                    reading_transitions = False
-                    continue
-                if "→" in line:
-                    left, right = line.split("→")
-                    state, symbol = left.split(",")
-                    new_state, write_symbol, direction = right.split(",")
-                    transitions[(state.strip(), symbol.strip())] = (
-                        new_state.strip(),
-                        write_symbol.strip(),
-                        direction.strip().upper(),
-                    )
+        elif reading_transitions:
+            if line.startswith("]"):
+                reading_transitions = False
+            elif "→" in line:
+                rules.append(line)
+
+    def split_list(name):
+        return [s.strip() for s in fields[name].split(",")] if name in fields else []
 
+    transitions = dict(parse_rule(rule) for rule in rules)
     return TuringMachine(
-        states, tape_symbols, blank, initial_state, final_states, transitions
+        split_list("states"),
+        split_list("tape symbols"),
+        fields.get("blank symbol", "_").strip(),
+        fields.get("initial state", "").strip(),
+        split_list("final states"),
+        transitions,
     )
 
 
+# Listage de chaque dossier de tests : {dossier: (date de modification, fichiers)},
+# invalidé quand la date de modification du dossier change
+_tests_cache = {}
+
+
+def list_test_files(test_dir):
+    """
+    Liste les fichiers de définition (.txt) d'un dossier.
+
+    :param test_dir: Dossier à parcourir
+    :return: Noms des fichiers .txt (list[str])
+    """
+    mtime = os.stat(test_dir).st_mtime_ns
+    cached = _tests_cache.get(test_dir)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with os.scandir(test_dir) as entries:
+        files = [e.name for e in entries if e.name.endswith(".txt")]
+    _tests_cache[test_dir] = (mtime, files)
+    return files
+
+
 def main():
     """
     Affiche un menu pour créer ou charger une machine de Turing.
@@ -264,7 +822,7 @@ def main():
         elif choice == "2":
             # Lister les fichiers dans tests
             test_dir = "tests"
-            files = [f for f in os.listdir(test_dir) if f.endswith(".txt")]
+            files = list_test_files(test_dir)
             if not files:
                 print("Aucun fichier de test trouvé dans le dossier 'tests'.")
                 continue
@@ -0,0 +1,107 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Noyau C de la boucle d'exécution de la machine de Turing.
+
+Module optionnel : main.py l'utilise s'il a été compilé, par exemple avec
+    cythonize -i tm_core.pyx
+"""
+
+
+cdef int _run(
+    unsigned char* tape,
+    Py_ssize_t cap,
+    Py_ssize_t* head_p,
+    Py_ssize_t* left_p,
+    Py_ssize_t* right_p,
+    int* state_p,
+    Py_ssize_t* steps_p,
+    const int* table,
+    const unsigned char* final,
+    int nsym,
+) noexcept nogil:
+    cdef Py_ssize_t head = head_p[0]
+    cdef Py_ssize_t left = left_p[0]
+    cdef Py_ssize_t right = right_p[0]
+    cdef int state = state_p[0]
+    cdef Py_ssize_t steps = steps_p[0]
+    cdef const int* transition
+    cdef int status
+
+    while True:
+        if final[state]:
+            status = 1
+            break
+        transition = table + (state * nsym + tape[head]) * 3
+        if transition[0] < 0:
+            status = 0
+            break
+        if steps == 0:
+            status = -2
+            break
+        steps -= 1
+        tape[head] = <unsigned char>transition[1]
+        head += transition[2]
+        state = transition[0]
+
+        # Étend la partie utile ; s'arrête si la tête sort du tampon
+        if head < left:
+            left = head
+            if head < 0:
+                status = -1
+                break
+        elif head >= right:
+            right = head + 1
+            if head >= cap:
+                status = -1
+                break
+
+    head_p[0] = head
+    left_p[0] = left
+    right_p[0] = right
+    state_p[0] = state
+    steps_p[0] = steps
+    return status
+
+
+def tm_run(
+    unsigned char[::1] tape,
+    Py_ssize_t head,
+    Py_ssize_t left,
+    Py_ssize_t right,
+    int state,
+    Py_ssize_t steps,
+    const int[::1] table,
+    const unsigned char[::1] final,
+    int nsym,
+):
+    """
+    Exécute la machine jusqu'à son arrêt, jusqu'à ce que la tête sorte du
+    tampon ou jusqu'à avoir appliqué steps transitions. Le GIL est relâché
+    pendant la boucle.
+
+    :param tape: Tampon du ruban, la partie utile étant [left, right)
+    :param table: Table de transition aplatie, 3 entiers par couple
+                  (état, symbole) : nouvel état (-1 si aucune transition),
+                  symbole écrit, déplacement
+    :param final: Octet non nul pour chaque état final
+    :param nsym: Nombre de symboles
+    :return: (statut, tête, left, right, état, étapes restantes) où le
+             statut vaut 1 si la machine accepte, 0 si elle rejette, -1 si le
+             tampon doit être agrandi avant de reprendre, -2 si les steps
+             transitions ont été appliquées sans que la machine s'arrête
+    """
+    cdef int status
+    with nogil:
+        status = _run(
+            &tape[0],
+            tape.shape[0],
+            &head,
+            &left,
+            &right,
+            &state,
+            &steps,
+            &table[0],
+            &final[0],
+            nsym,
+        )
+    return status, head, left, right, state, steps